@@ -1,9 +1,664 @@
-from flask import Flask, request, jsonify
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import orjson
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from flask import Flask, request, url_for
 from flask_cors import CORS
-from pulp import LpMaximize, LpProblem, LpVariable, lpSum, LpStatus, value
+from pulp import (
+    PULP_CBC_CMD,
+    HiGHS,
+    HiGHS_CMD,
+    LpAffineExpression,
+    LpBinary,
+    LpConstraint,
+    LpConstraintLE,
+    LpMaximize,
+    LpProblem,
+    LpSolutionIntegerFeasible,
+    LpStatus,
+    LpVariable,
+)
+
+try:
+    import highspy
+except ImportError:
+    # Without highspy, PuLP's in-process HiGHS backend isn't available (see _detect_solver_backend)
+    highspy = None
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the coefficient kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+logger = logging.getLogger(__name__)
+# Set LOG_LEVEL=DEBUG to see per-request solver progress (unknown levels fall back to INFO)
+_log_level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
+# The module logs through its own handler: under gunicorn nothing configures the root logger,
+# and Python's last-resort handler would drop every record below WARNING
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+logger.addHandler(_log_handler)
+logger.propagate = False
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend requests
+CORS(app, expose_headers=['ETag'])  # Enable CORS for frontend requests
+
+def _json_response(body, status=200):
+    """JSON response serialized with orjson (much faster than Flask's stdlib-based jsonify)"""
+    return app.response_class(orjson.dumps(body), status=status, mimetype='application/json')
+
+def _detect_solver_backend():
+    """
+    Picks the MILP solver once at startup. HiGHS is preferred: through highspy it solves
+    in-process, avoiding the MPS/solution file round trip PULP_CBC_CMD makes for every
+    solve. The highs binary is the next choice, and PuLP's bundled CBC is always available.
+    """
+    for solver_class in (HiGHS, HiGHS_CMD):
+        if solver_class(msg=False).available():
+            return solver_class
+    return PULP_CBC_CMD
+
+SOLVER_BACKEND = _detect_solver_backend()
+
+class _WarmStartHiGHS(HiGHS):
+    """
+    PuLP's in-process HiGHS solver, plus a MIP start: PuLP's wrapper has no warmStart
+    option, so the variables' initial values (setInitialValue) are handed to highspy here,
+    after PuLP has built the model and before it runs.
+    """
+    def callSolver(self, lp):
+        # buildSolverModel numbers the columns in lp.variables() order
+        solution = highspy.HighsSolution()
+        solution.col_value = [var.varValue or 0.0 for var in lp.variables()]
+        lp.solverModel.setSolution(solution)
+        super().callSolver(lp)
+
+# Solves stop at the time limit and keep the best plan found so far. There's deliberately
+# no looser gap tolerance: the slot bonuses dominate the objective, so any relative gap
+# worth having also covers whole meal slots and the expiry terms that pick the recipes
+SOLVER_TIME_LIMIT_SECONDS = 5
+# Each solve process runs one solve at a time and the pool has a process per CPU, so a
+# multi-threaded solver would oversubscribe the machine
+SOLVER_THREADS = 1
+
+# Solver instances hold only their configuration, so each process creates them once
+_solvers = {}
+
+def get_solver(warm_start=False):
+    """
+    Returns this process's solver instance of the selected backend, configured for the meal
+    planning MILP: every backend gets the time limit and thread count above, in-process
+    HiGHS also gets presolve on, and CBC gets presolve and cuts on (HiGHS_CMD otherwise
+    keeps its defaults).
+    """
+    solver = _solvers.get(warm_start)
+    if solver is None:
+        solver = _solvers[warm_start] = _create_solver(warm_start)
+    return solver
+
+def _create_solver(warm_start):
+    """
+    Creates a solver instance of the selected backend (see get_solver).
+    
+    With warm_start=True the variables' initial values (setInitialValue) are passed to the
+    solver as a MIP start.
+    """
+    if SOLVER_BACKEND is HiGHS:
+        # PuLP's msg flag doesn't silence highspy's own console output, output_flag does
+        return (_WarmStartHiGHS if warm_start else HiGHS)(
+            msg=False, timeLimit=SOLVER_TIME_LIMIT_SECONDS, threads=SOLVER_THREADS,
+            output_flag=False, presolve='on'
+        )
+    if SOLVER_BACKEND is HiGHS_CMD:
+        return HiGHS_CMD(
+            msg=False, timeLimit=SOLVER_TIME_LIMIT_SECONDS, threads=SOLVER_THREADS,
+            warmStart=warm_start
+        )
+    return PULP_CBC_CMD(
+        msg=False, timeLimit=SOLVER_TIME_LIMIT_SECONDS, threads=SOLVER_THREADS,
+        presolve=True, cuts=True, warmStart=warm_start
+    )
+
+def _solve_status(prob):
+    """
+    Status name of prob's last solve. PuLP reports a solve stopped at the time limit with an
+    incumbent as Optimal with an integer feasible solution; that plan is usable, but it's
+    reported as Feasible since optimality wasn't proven. A time limit stop without one is
+    Not Solved.
+    """
+    if prob.sol_status == LpSolutionIntegerFeasible:
+        return 'Feasible'
+    return LpStatus[prob.status]
+
+@njit(cache=True)
+def compute_recipe_values(indptr, item_idx, amount, expiry_weight):
+    """
+    Sum of expiry_weight * amount over each recipe's ingredients, with recipes given in CSR
+    form: recipe r uses items item_idx[indptr[r]:indptr[r + 1]] in the matching amounts.
+    """
+    n_recipes = len(indptr) - 1
+    values = np.zeros(n_recipes, dtype=np.float64)
+    for r in range(n_recipes):
+        total = 0.0
+        for k in range(indptr[r], indptr[r + 1]):
+            total += expiry_weight[item_idx[k]] * amount[k]
+        values[r] = total
+    return values
+
+@njit(cache=True)
+def compute_expiry_mask(indptr, item_idx, first_forbidden_day, days):
+    """
+    usable[r, d] is True when none of recipe r's ingredients (CSR form, see
+    compute_recipe_values) is past its first forbidden day on day d.
+    """
+    n_recipes = len(indptr) - 1
+    usable = np.ones((n_recipes, days), dtype=np.bool_)
+    for r in range(n_recipes):
+        for k in range(indptr[r], indptr[r + 1]):
+            for d in range(first_forbidden_day[item_idx[k]], days):
+                usable[r, d] = False
+    return usable
+
+def _plan_by_matching(days, n_meals, recipe_values_scaled, usable, base_slot_fill_bonus):
+    """
+    Plans meals as a min-weight bipartite matching, for requests whose inventory limits can't bind.
+    
+    Without inventory limits the ILP is an assignment problem between the days * n_meals slots and
+    a per-day copy of every recipe (block diagonal, so no recipe is used twice on one day), which
+    scipy solves in polynomial time instead of branch and bound. usable[d, r] says whether
+    recipe r may be served on day d (none of its ingredients expired).
+    
+    Returns choices[d][mi] = recipe index, or None if some day can't be filled completely or the
+    no-consecutive-days rule can't be met by reordering meals; the caller then solves the ILP.
+    """
+    n_recipes = len(recipe_values_scaled)
+    if n_recipes < n_meals:
+        return None
+    
+    day_priority = (days - np.arange(days) + 1) ** 2
+    slot_bonus = base_slot_fill_bonus * day_priority
+    # Filling a slot has to pay off, otherwise the ILP could prefer leaving it empty
+    if slot_bonus.min() + recipe_values_scaled.min() <= 0:
+        return None
+    
+    # One edge per (slot, recipe usable that day), weighted with the negated objective coefficient
+    day_idx, recipe_idx = np.nonzero(usable)
+    rows = (day_idx * n_meals)[:, np.newaxis] + np.arange(n_meals)[np.newaxis, :]
+    cols = np.repeat((day_idx * n_recipes + recipe_idx)[:, np.newaxis], n_meals, axis=1)
+    weights = np.repeat(-(slot_bonus[day_idx] + recipe_values_scaled[recipe_idx])[:, np.newaxis], n_meals, axis=1)
+    biadjacency = csr_matrix(
+        (weights.ravel(), (rows.ravel(), cols.ravel())),
+        shape=(days * n_meals, days * n_recipes)
+    )
+    
+    try:
+        slot_ind, col_ind = min_weight_full_bipartite_matching(biadjacency)
+    except ValueError:
+        # Some day has fewer usable recipes than meal slots
+        return None
+    
+    choices = np.empty(days * n_meals, dtype=np.int64)
+    choices[slot_ind] = col_ind % n_recipes
+    choices = choices.reshape(days, n_meals)
+    
+    # Meal slots within a day are interchangeable, so rotate each day's recipes until
+    # no meal repeats the recipe it had the day before
+    for d in range(1, days):
+        for shift in range(n_meals):
+            rotated = np.roll(choices[d], shift)
+            if not np.any(rotated == choices[d - 1]):
+                choices[d] = rotated
+                break
+        else:
+            return None
+    
+    return choices
+
+def _build_schedule(choices, meals, recipes):
+    """Builds the response schedule from choices[d][mi] = recipe index (-1 for an empty slot)"""
+    schedule = []
+    for d, day_choices in enumerate(choices):
+        day_meals = [
+            {"type": m, "recipeId": recipes[r_idx]['id']}
+            for m, r_idx in zip(meals, day_choices)
+            if r_idx >= 0
+        ]
+        # Only add days that have at least one meal (filter out empty days)
+        if len(day_meals) > 0:
+            schedule.append({
+                "day": f"Day {d + 1}",
+                "meals": day_meals
+            })
+    return schedule
+
+# Each solve process keeps the last problem it built and reuses it for the next request of
+# the same shape (days, meal types and recipe ids). Only the request specific parts are
+# replaced per solve, so the variables and shape-only constraints aren't rebuilt every time
+_problem_template = None
+_problem_template_lock = threading.Lock()
+
+def _get_problem_template(days, meals, recipe_ids):
+    """
+    Returns this process's problem template for the given shape, building a new one if the
+    shape changed. Callers must hold _problem_template_lock while using it.
+    
+    The template holds the problem, its variables x[d, mi, ri], the constraints that
+    only depend on the shape, and every NoConsecutive constraint (each request adds the
+    ones that apply to it).
+    """
+    global _problem_template
+    key = (days, tuple(meals), tuple(recipe_ids))
+    if _problem_template is not None and _problem_template['key'] == key:
+        return _problem_template
+    
+    # Create the optimization problem
+    prob = LpProblem("MealPlanOptimization", LpMaximize)
+    
+    # Decision variables: x[d, mi, ri] = 1 if recipe ri is used for meal mi on day d, else 0
+    # (named x_{d}_{meal}_{recipe id}). Kept in an object array indexed by position, so lookups
+    # don't hash meal names and recipe ids, and slices like x[d, mi] select whole rows
+    x = np.array(
+        LpVariable.matrix("x", (range(days), meals, recipe_ids), cat=LpBinary), dtype=object
+    ).reshape(days, len(meals), len(recipe_ids))
+    
+    # Constraint 1: Each meal slot can have at most one recipe (allows empty slots if inventory runs out)
+    # The large slot_fill_bonus in the objective will encourage filling all slots when possible
+    for d in range(days):
+        for mi, m in enumerate(meals):
+            prob += LpConstraint(((var, 1) for var in x[d, mi]), LpConstraintLE, f"AtMostOneRecipePerMeal_{d}_{m}", 1)
+    
+    # Constraint 1b: No duplicate recipes on the same day (different meal types can't use same recipe)
+    # With a single meal type this is already implied by constraint 1, so the rows are skipped
+    if len(meals) > 1:
+        for d in range(days):
+            for ri, rid in enumerate(recipe_ids):
+                # At most one meal per day can use this recipe
+                prob += LpConstraint(((var, 1) for var in x[d, :, ri]), LpConstraintLE, f"NoDuplicateRecipe_{d}_{rid}", 1)
+    
+    # Constraint 3 (see optimize_meal_plan): if recipe r is used on day d, it shouldn't be
+    # used on day d+1 for the same meal
+    no_consecutive = {}
+    for d in range(days - 1):  # Don't check last day
+        for mi, m in enumerate(meals):
+            for ri, rid in enumerate(recipe_ids):
+                no_consecutive[(d, mi, ri)] = LpConstraint(
+                    ((x[d, mi, ri], 1), (x[d + 1, mi, ri], 1)),
+                    LpConstraintLE,
+                    f"NoConsecutive_{d}_{m}_{rid}",
+                    1,
+                )
+    
+    _problem_template = {
+        'key': key,
+        'prob': prob,
+        'x': x,
+        'shape_constraints': OrderedDict(prob.constraints),
+        'no_consecutive': no_consecutive,
+    }
+    return _problem_template
+
+def optimize_meal_plan(inventory, recipes, days, meals):
+    """
+    Builds and solves the meal planning ILP for an already validated request
+    (or assigns meals directly when inventory is ample, see _plan_by_matching).
+    
+    Returns a (response_body, http_status) tuple.
+    """
+    # Objective: Maximize weighted inventory usage + bonus for filling meal slots
+    # Higher expiry_weight items should be prioritized (they're expiring soon)
+    # Large bonus for filling any meal slot (encourages complete plans)
+    # Use day priority: earlier days get much higher multiplier to ensure they're filled first
+    base_slot_fill_bonus = 10000.0
+    
+    # Sparse usage index: item_name -> [(recipe index, amount needed), ...]
+    item_uses = defaultdict(list)
+    for r_idx, r in enumerate(recipes):
+        for item_name, amount_needed in r.get('ingredients', {}).items():
+            item_uses[item_name].append((r_idx, amount_needed))
+    
+    # Per-item limits: (item_name, available quantity, first day the item may no longer be used or None)
+    # If days_until_expiry is provided, usage is prevented on days >= days_until_expiry
+    # (days are 0-indexed, so if item expires in 2 days, it can be used on day 0 and 1, but not day 2+)
+    item_limits = []
+    for item_name, item_data in inventory.items():
+        # Handle both dict format and direct access
+        if isinstance(item_data, dict):
+            available_qty = item_data.get('qty', 0.0)
+        else:
+            available_qty = float(item_data) if isinstance(item_data, (int, float)) else 0.0
+        
+        first_forbidden_day = None
+        if isinstance(item_data, dict) and 'days_until_expiry' in item_data:
+            try:
+                days_until_expiry_raw = item_data.get('days_until_expiry', days + 1)
+                # Handle float or int, and ensure it's a valid integer
+                days_until_expiry = int(round(float(days_until_expiry_raw)))
+                # If item is already expired (days_until_expiry <= 0), prevent all usage;
+                # if it expires during the plan period, prevent usage from the expiry day on
+                first_forbidden_day = max(days_until_expiry, 0)
+            except (ValueError, TypeError) as e:
+                # If days_until_expiry is invalid, log but don't crash
+                logger.warning("Invalid days_until_expiry for %s: %r, error: %s", item_name, item_data.get('days_until_expiry'), e)
+                # Continue without expiry constraint for this item
+        
+        item_limits.append((item_name, available_qty, first_forbidden_day))
+    
+    # Encode inventory as per-item arrays and recipes as CSR rows over inventory items
+    # (ingredients missing from the inventory add no value) for the numeric kernels
+    item_index = {item_name: i for i, item_name in enumerate(inventory)}
+    expiry_weights = np.array([
+        # Handle both dict format and direct access
+        item_data.get('expiry_weight', 1.0) if isinstance(item_data, dict) else 1.0
+        for item_data in inventory.values()
+    ], dtype=np.float64)
+    # First forbidden day per item, clipped to days (= never forbidden within the plan)
+    first_forbidden_days = np.array([
+        days if first_forbidden_day is None else min(first_forbidden_day, days)
+        for _, _, first_forbidden_day in item_limits
+    ], dtype=np.int64)
+    recipe_indptr = np.zeros(len(recipes) + 1, dtype=np.int64)
+    recipe_item_idx = []
+    recipe_amounts = []
+    for r_idx, r in enumerate(recipes):
+        for item_name, amount_needed in r.get('ingredients', {}).items():
+            if item_name in item_index:
+                recipe_item_idx.append(item_index[item_name])
+                recipe_amounts.append(amount_needed)
+        recipe_indptr[r_idx + 1] = len(recipe_item_idx)
+    recipe_item_idx = np.array(recipe_item_idx, dtype=np.int64)
+    recipe_amounts = np.array(recipe_amounts, dtype=np.float64)
+    
+    # Calculate the "value" of each recipe once, up front
+    # Sum of (expiry_weight * ingredient_amount) for all ingredients in this recipe
+    recipe_values = compute_recipe_values(recipe_indptr, recipe_item_idx, recipe_amounts, expiry_weights)
+    
+    # Scale recipe_value to make expiry priority competitive with day priority
+    # Multiply by a factor to ensure expiry-weighted recipes are preferred
+    recipe_values_scaled = recipe_values * 100.0  # Scale up expiry effect
+    
+    # An empty plan is always feasible, unless an item's quantity is negative and no recipe
+    # can offset it. Then the initial solve and every fallback would fail, so report it
+    # without solving anything
+    if any(
+        available_qty < 0 and all(amount >= 0 for _, amount in item_uses.get(item_name, ()))
+        for item_name, available_qty, _ in item_limits
+    ):
+        return {
+            "status": "Infeasible",
+            "message": "Solver status: Infeasible. No feasible solution found."
+        }, 400
+    
+    # An item's inventory limit can't bind when it covers the worst case: every day's meals
+    # all using the recipes that need the most of it (a recipe appears at most once per day)
+    worst_case_usage = {
+        item_name: days * sum(sorted((max(amount, 0.0) for _, amount in item_uses.get(item_name, ())), reverse=True)[:len(meals)])
+        for item_name, _, _ in item_limits
+    }
+    
+    # Fast path: if no inventory limit can bind, the ILP reduces to an assignment problem
+    inventory_is_ample = all(
+        available_qty >= worst_case_usage[item_name]
+        for item_name, available_qty, _ in item_limits
+    )
+    # usable[r, d]: recipe r has no expired ingredients on day d (used by both paths)
+    usable = compute_expiry_mask(recipe_indptr, recipe_item_idx, first_forbidden_days, days)
+    if inventory_is_ample:
+        choices = _plan_by_matching(days, len(meals), recipe_values_scaled, usable.T, base_slot_fill_bonus)
+        if choices is not None:
+            return {
+                "status": "Optimal",
+                "schedule": _build_schedule(choices, meals, recipes)
+            }, 200
+    
+    # The problem template is shared by every request this process solves, so hold the lock
+    # from setting it up for this request until the solution has been read back
+    with _problem_template_lock:
+        template = _get_problem_template(days, meals, [r['id'] for r in recipes])
+        prob, x = template['prob'], template['x']
+        
+        # Drop whatever the previous request left on the template: its inventory rows and
+        # NoConsecutive selection, and the variable bounds fixed for expiry or fewer days
+        prob.constraints = OrderedDict(template['shape_constraints'])
+        prob.modifiedConstraints = []
+        for var in x.flat:
+            var.upBound = 1
+        
+        def build_objective(plan_days):
+            """Objective over the first plan_days days, with day priority relative to plan_days"""
+            # Add recipe value plus bonus for filling the slot
+            # Earlier days get exponentially higher priority: Day 1 gets (days+1)^2, Day 2 gets days^2, etc.
+            # This strongly encourages filling earlier days completely before later days
+            day_priority = (plan_days - np.arange(plan_days) + 1) ** 2  # Day 1: (7+1)^2=64, Day 2: 36, etc.
+            slot_bonus = base_slot_fill_bonus * day_priority
+            # coefficients[d, mi, ri] is the same for every meal slot on day d
+            coefficients = np.broadcast_to(
+                (slot_bonus[:, np.newaxis] + recipe_values_scaled[np.newaxis, :])[:, np.newaxis, :],
+                x[:plan_days].shape
+            )
+            # Terms are handed to LpAffineExpression as (variable, coefficient) pairs directly,
+            # which avoids the intermediate expression copies lpSum makes
+            return LpAffineExpression(zip(x[:plan_days].flat, coefficients.ravel().tolist()))
+        
+        prob.setObjective(build_objective(days))
+        prob.objective.name = "Maximize_Weighted_Inventory_Usage"
+        
+        # Constraint 2: Inventory constraints - don't exceed available inventory
+        for item_name, available_qty, _ in item_limits:
+            # Sum of all usage of this item across all days and meals
+            # Only recipes that actually use the item contribute terms
+            total_usage = (
+                (var, amount_needed)
+                for r_idx, amount_needed in item_uses.get(item_name, ())
+                for var in x[:, :, r_idx].flat
+            )
+            
+            # Limits that can't bind (see worst_case_usage) are left out of the model
+            if available_qty < worst_case_usage[item_name]:
+                prob += LpConstraint(total_usage, LpConstraintLE, f"InventoryLimit_{item_name}", available_qty)
+        
+        # Constraint 2b: Don't use items after they expire
+        # Fixing the variable bounds (rather than adding x == 0 rows) keeps the LP small
+        # and lets the solver's presolve drop those columns outright. The expiry mask already
+        # combines every item's expiry per recipe, so one masked pass covers all fixings:
+        # x is (days, meals, recipes) and the mask selects (day, recipe) pairs
+        for var in x.transpose(0, 2, 1)[~usable.T].flat:
+            var.upBound = 0
+        
+        # Constraint 3: Avoid same recipe on consecutive days (for same meal type)
+        # This constraint can make the problem infeasible with limited recipes, so we'll try with and without it
+        # Constraint names are kept so the relaxed fallback can drop them from the problem in place
+        no_consecutive_constraints = {}
+        for (d, mi, ri), constraint in template['no_consecutive'].items():
+            # Pairs where either variable is fixed to zero (expired ingredients) can't conflict
+            if x[d, mi, ri].upBound == 0 or x[d + 1, mi, ri].upBound == 0:
+                continue
+            prob += constraint
+            no_consecutive_constraints[(d, mi, ri)] = constraint.name
+        
+        # Solve the problem
+        solver = get_solver()
+        prob.solve(solver)
+        
+        # Check solution status
+        status_code = _solve_status(prob)
+        
+        # If infeasible, try without consecutive constraints (but keep no-duplicate and exactly-one constraints)
+        # The fallbacks modify the existing problem in place rather than rebuilding it. They only
+        # run on proven infeasibility: a time limit stop (Not Solved) is returned as is, since
+        # more solves would overrun the job timeout and quietly shorten a plan for a hard instance
+        if status_code == 'Infeasible':
+            logger.debug("Initial solve failed with status %s. Trying without consecutive day constraints...", status_code)
+            for constraint_name in no_consecutive_constraints.values():
+                del prob.constraints[constraint_name]
+            
+            # Each fallback re-solve starts from the previous solve's values
+            def seed_from_previous_solve(plan_days):
+                """Set every variable's initial value from the last solve, zeroing days past plan_days and fixed variables"""
+                for d, day_vars in enumerate(x):
+                    for var in day_vars.flat:
+                        if d < plan_days and var.upBound != 0:
+                            var.setInitialValue(1 if (var.varValue or 0.0) > 0.5 else 0)
+                        else:
+                            var.setInitialValue(0)
+            
+            solver = get_solver(warm_start=True)
+            seed_from_previous_solve(days)
+            
+            # Solve without consecutive constraints
+            prob.solve(solver)
+            status_code = _solve_status(prob)
+            logger.debug("Relaxed solve status: %s", status_code)
+            
+            # If still infeasible, try with fewer days
+            if status_code == 'Infeasible':
+                logger.debug("Still infeasible. Trying with fewer days...")
+                # Try reducing days progressively: days past the cutoff are fixed to zero
+                # (fixings accumulate as the cutoff moves down) and the objective is
+                # re-weighted so day priority is relative to the shorter plan
+                for reduced_days in range(days - 1, 0, -1):
+                    for var in x[reduced_days].flat:
+                        var.upBound = 0
+                    prob.setObjective(build_objective(reduced_days))
+                    seed_from_previous_solve(reduced_days)
+                    
+                    prob.solve(solver)
+                    status_code = _solve_status(prob)
+                    if status_code in ['Optimal', 'Feasible']:
+                        days = reduced_days  # Update days for solution extraction
+                        logger.debug("Found feasible solution with %d days", reduced_days)
+                        break
+                    if status_code != 'Infeasible':
+                        break
+        
+        if status_code == 'Optimal' or status_code == 'Feasible':
+            # Extract the solution: read every variable value in one pass into a
+            # (days, meals, recipes) array, then pick each slot's recipe with argmax
+            planned = x[:days]
+            values = np.fromiter(
+                ((var.varValue or 0.0) for var in planned.flat),
+                dtype=np.float64,
+                count=planned.size
+            ).reshape(planned.shape)
+            # Solvers report binaries within a tolerance (e.g. 0.9999999), so threshold rather than compare to 1
+            choices = np.where(values.max(axis=2) > 0.5, values.argmax(axis=2), -1)
+            schedule = _build_schedule(choices, meals, recipes)
+            
+            return {
+                "status": status_code,
+                "schedule": schedule
+            }, 200
+        else:
+            return {
+                "status": status_code,
+                "message": f"Solver status: {status_code}. No feasible solution found."
+            }, 400
+
+# Solves run in a process pool so they never tie up a request thread (and a large model
+# can't exhaust the web process's memory). POST /solve hands back a job id, and
+# GET /solve/<job_id> is polled for the result.
+SOLVE_TIMEOUT_SECONDS = 30
+MAX_CACHED_SOLVES = 64
+MAX_TRACKED_JOBS = 256
+
+_executor = None
+_executor_lock = threading.Lock()
+# RLock: a done-callback runs immediately (under the lock) if its future already finished
+_state_lock = threading.RLock()
+# Canonical payload -> Future. Identical payloads share one solve, and completed futures
+# double as the result cache (least recently used evicted first)
+_solve_futures = OrderedDict()
+# Job id -> (Future, ETag, submission time)
+_jobs = OrderedDict()
+
+def _get_executor():
+    """Creates the solver process pool on first use, i.e. after any server worker fork"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_solve_worker)
+        return _executor
+
+def _discard_executor(broken_executor):
+    """
+    Drops a pool that broke because a worker died (e.g. killed for running out of memory),
+    so the next _get_executor call starts a fresh one
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is broken_executor:
+            _executor = None
+    broken_executor.shutdown(wait=False)
+
+def _init_solve_worker():
+    """
+    Solve process initializer: does the per-process setup once when the worker starts, so
+    the first request it picks up doesn't pay for it. Loads the numba kernels (compiling
+    them if their on-disk cache is cold) and creates the worker's solvers.
+    """
+    # Empty inputs with the dtypes optimize_meal_plan uses select the same compiled signatures
+    indptr = np.zeros(1, dtype=np.int64)
+    item_idx = np.zeros(0, dtype=np.int64)
+    compute_recipe_values(indptr, item_idx, np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64))
+    compute_expiry_mask(indptr, item_idx, np.zeros(0, dtype=np.int64), 1)
+    get_solver()
+    get_solver(warm_start=True)
+
+def _solve_payload(payload_key):
+    """Worker entry point: solves a canonicalized request payload (see solve_meal_plan)"""
+    payload = orjson.loads(payload_key)
+    return optimize_meal_plan(payload['inventory'], payload['recipes'], payload['days'], payload['meals'])
+
+def _submit_solve(payload_key):
+    """
+    Returns the Future solving payload_key, submitting it to the worker pool unless an
+    identical payload is already queued, running or cached.
+    
+    The Future's (response_body, http_status) result is shared between callers and must not be mutated.
+    """
+    with _state_lock:
+        future = _solve_futures.get(payload_key)
+        if future is not None:
+            _solve_futures.move_to_end(payload_key)
+            return future
+        
+        executor = _get_executor()
+        try:
+            future = executor.submit(_solve_payload, payload_key)
+        except BrokenProcessPool:
+            # The solves that were running on the broken pool fail with it; new ones get a new pool
+            logger.warning("Solver process pool broke, starting a new one")
+            _discard_executor(executor)
+            future = _get_executor().submit(_solve_payload, payload_key)
+        _solve_futures[payload_key] = future
+        if len(_solve_futures) > MAX_CACHED_SOLVES:
+            _solve_futures.popitem(last=False)
+        
+        def forget_failed_solve(done_future):
+            # Failed solves aren't cached, so the next identical request retries
+            if done_future.cancelled() or done_future.exception() is not None:
+                with _state_lock:
+                    if _solve_futures.get(payload_key) is done_future:
+                        del _solve_futures[payload_key]
+        
+        future.add_done_callback(forget_failed_solve)
+        return future
 
 @app.route('/solve', methods=['POST'])
 def solve_meal_plan():
@@ -24,7 +679,11 @@ def solve_meal_plan():
         "meals": ["Breakfast", "Lunch", "Dinner"]
     }
     
-    Returns:
+    The solve runs in the background: this endpoint responds 202 with
+    {"status": "Pending", "job_id": "..."} (and a Location header), and
+    GET /solve/<job_id> returns the result once the solver finishes.
+    
+    Result:
     {
         "status": "Optimal" | "Feasible" | "Infeasible" | "Error",
         "message": "Optional error message",
@@ -41,13 +700,13 @@ def solve_meal_plan():
     }
     """
     try:
-        data = request.get_json()
+        data = orjson.loads(request.get_data())
         
         if not data:
-            return jsonify({
+            return _json_response({
                 "status": "Error",
                 "message": "No JSON data provided"
-            }), 400
+            }, 400)
         
         inventory = data.get('inventory', {})
         recipes = data.get('recipes', [])
@@ -56,347 +715,131 @@ def solve_meal_plan():
         
         # Better validation with detailed error messages
         if inventory is None or (isinstance(inventory, dict) and len(inventory) == 0):
-            return jsonify({
+            return _json_response({
                 "status": "Error",
                 "message": f"Invalid or empty inventory. Received: {type(inventory).__name__}, length: {len(inventory) if hasattr(inventory, '__len__') else 'N/A'}"
-            }), 400
+            }, 400)
         
         if recipes is None or (isinstance(recipes, list) and len(recipes) == 0):
-            return jsonify({
+            return _json_response({
                 "status": "Error",
                 "message": f"Invalid or empty recipes list. Received: {type(recipes).__name__}, length: {len(recipes) if hasattr(recipes, '__len__') else 'N/A'}"
-            }), 400
+            }, 400)
         
         if meals is None or (isinstance(meals, list) and len(meals) == 0):
-            return jsonify({
+            return _json_response({
                 "status": "Error",
                 "message": f"Invalid or empty meals list. Received: {type(meals).__name__}, length: {len(meals) if hasattr(meals, '__len__') else 'N/A'}"
-            }), 400
+            }, 400)
         
         # Validate days
         if not isinstance(days, int) or days < 1 or days > 7:
-            return jsonify({
+            return _json_response({
                 "status": "Error",
                 "message": f"Days must be an integer between 1 and 7. Received: {days} (type: {type(days).__name__})"
-            }), 400
-        
-        # Debug logging (remove in production)
-        print(f"Received request: days={days}, meals={meals}, inventory_keys={list(inventory.keys())[:5]}, recipes_count={len(recipes)}")
+            }, 400)
         
-        # Create the optimization problem
-        prob = LpProblem("MealPlanOptimization", LpMaximize)
+        # %-style arguments are only formatted when DEBUG logging is enabled
+        logger.debug("Received request: days=%d, meals=%s, inventory_items=%d, recipes_count=%d", days, meals, len(inventory), len(recipes))
         
-        # Decision variables: x[d][m][r] = 1 if recipe r is used for meal m on day d, else 0
-        x = {}
-        for d in range(days):
-            for m in meals:
-                for r in recipes:
-                    x[(d, m, r['id'])] = LpVariable(f"x_{d}_{m}_{r['id']}", cat='Binary')
-        
-        # Objective: Maximize weighted inventory usage + bonus for filling meal slots
-        # Higher expiry_weight items should be prioritized (they're expiring soon)
-        objective_terms = []
-        # Large bonus for filling any meal slot (encourages complete plans)
-        # Use day priority: earlier days get much higher multiplier to ensure they're filled first
-        base_slot_fill_bonus = 10000.0
-        
-        for d in range(days):
-            for m in meals:
-                for r in recipes:
-                    # Calculate the "value" of using this recipe
-                    # Sum of (expiry_weight * ingredient_amount) for all ingredients in this recipe
-                    recipe_value = 0.0
-                    for item_name, amount_needed in r.get('ingredients', {}).items():
-                        if item_name in inventory:
-                            item_data = inventory[item_name]
-                            # Handle both dict format and direct access
-                            if isinstance(item_data, dict):
-                                expiry_weight = item_data.get('expiry_weight', 1.0)
-                            else:
-                                expiry_weight = 1.0
-                            recipe_value += expiry_weight * amount_needed
-                    
-                    # Scale recipe_value to make expiry priority competitive with day priority
-                    # Multiply by a factor to ensure expiry-weighted recipes are preferred
-                    recipe_value_scaled = recipe_value * 100.0  # Scale up expiry effect
-                    
-                    # Add recipe value plus bonus for filling the slot
-                    # Earlier days get exponentially higher priority: Day 1 gets (days+1)^2, Day 2 gets days^2, etc.
-                    # This strongly encourages filling earlier days completely before later days
-                    day_priority_multiplier = (days - d + 1) ** 2  # Day 1: (7+1)^2=64, Day 2: 36, etc.
-                    slot_bonus = base_slot_fill_bonus * day_priority_multiplier
-                    objective_terms.append((recipe_value_scaled + slot_bonus) * x[(d, m, r['id'])])
+        # Identical payloads (common while experimenting in the UI) share one solve and its cached result.
+        # The canonical JSON form is the cache key; its digest is the result's ETag (see solve_job_status).
+        payload_key = orjson.dumps(
+            {"inventory": inventory, "recipes": recipes, "days": days, "meals": meals},
+            option=orjson.OPT_SORT_KEYS
+        )
+        etag = hashlib.blake2b(payload_key, digest_size=16).hexdigest()
         
-        prob += lpSum(objective_terms), "Maximize_Weighted_Inventory_Usage"
+        future = _submit_solve(payload_key)
+        job_id = uuid.uuid4().hex
+        with _state_lock:
+            _jobs[job_id] = (future, etag, time.monotonic())
+            if len(_jobs) > MAX_TRACKED_JOBS:
+                _jobs.popitem(last=False)
         
-        # Constraint 1: Each meal slot can have at most one recipe (allows empty slots if inventory runs out)
-        # The large slot_fill_bonus in the objective will encourage filling all slots when possible
-        for d in range(days):
-            for m in meals:
-                prob += lpSum([x[(d, m, r['id'])] for r in recipes]) <= 1, f"AtMostOneRecipePerMeal_{d}_{m}"
-        
-        # Constraint 1b: No duplicate recipes on the same day (different meal types can't use same recipe)
-        for d in range(days):
-            for r in recipes:
-                # At most one meal per day can use this recipe
-                prob += lpSum([x[(d, m, r['id'])] for m in meals]) <= 1, f"NoDuplicateRecipe_{d}_{r['id']}"
-        
-        # Constraint 2: Inventory constraints - don't exceed available inventory
-        for item_name, item_data in inventory.items():
-            # Handle both dict format and direct access
-            if isinstance(item_data, dict):
-                available_qty = item_data.get('qty', 0.0)
-            else:
-                available_qty = float(item_data) if isinstance(item_data, (int, float)) else 0.0
-            
-            # Sum of all usage of this item across all days and meals
-            total_usage = lpSum([
-                r.get('ingredients', {}).get(item_name, 0.0) * x[(d, m, r['id'])]
-                for d in range(days)
-                for m in meals
-                for r in recipes
-            ])
-            
-            prob += total_usage <= available_qty, f"InventoryLimit_{item_name}"
-            
-            # Constraint 2b: Don't use items after they expire
-            # If days_until_expiry is provided, prevent usage on days >= days_until_expiry
-            # (days are 0-indexed, so if item expires in 2 days, it can be used on day 0 and 1, but not day 2+)
-            if isinstance(item_data, dict) and 'days_until_expiry' in item_data:
-                try:
-                    days_until_expiry_raw = item_data.get('days_until_expiry', days + 1)
-                    # Handle float or int, and ensure it's a valid integer
-                    days_until_expiry = int(round(float(days_until_expiry_raw)))
-                    # If item is already expired (days_until_expiry <= 0), prevent all usage
-                    if days_until_expiry <= 0:
-                        # Item is already expired, prevent all usage
-                        for d in range(days):
-                            for m in meals:
-                                for r in recipes:
-                                    if item_name in r.get('ingredients', {}):
-                                        prob += x[(d, m, r['id'])] == 0, f"ExpiredItem_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                    # If item expires during the plan period, prevent usage after expiry
-                    elif days_until_expiry < days:
-                        for d in range(days_until_expiry, days):
-                            for m in meals:
-                                for r in recipes:
-                                    # Only prevent if this recipe actually uses this item
-                                    if item_name in r.get('ingredients', {}):
-                                        prob += x[(d, m, r['id'])] == 0, f"ExpiredItem_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                except (ValueError, TypeError) as e:
-                    # If days_until_expiry is invalid, log but don't crash
-                    print(f"Warning: Invalid days_until_expiry for {item_name}: {item_data.get('days_until_expiry')}, error: {e}")
-                    # Continue without expiry constraint for this item
-        
-        # Constraint 3: Avoid same recipe on consecutive days (for same meal type)
-        # This constraint can make the problem infeasible with limited recipes, so we'll try with and without it
-        for d in range(days - 1):  # Don't check last day
-            for m in meals:
-                for r in recipes:
-                    # If recipe r is used on day d, it shouldn't be used on day d+1 for the same meal
-                    prob += x[(d, m, r['id'])] + x[(d + 1, m, r['id'])] <= 1, f"NoConsecutive_{d}_{m}_{r['id']}"
-        
-        # Solve the problem
-        prob.solve()
-        
-        # Check solution status
-        status_code = LpStatus[prob.status]
-        
-        # If infeasible, try without consecutive constraints (but keep no-duplicate and exactly-one constraints)
-        if status_code not in ['Optimal', 'Feasible']:
-            print(f"Initial solve failed with status {status_code}. Trying without consecutive day constraints...")
-            # Rebuild problem without consecutive constraints
-            prob2 = LpProblem("MealPlanOptimization_Relaxed", LpMaximize)
-            prob2 += lpSum(objective_terms), "Maximize_Weighted_Inventory_Usage"
-            
-            # Add constraints 1 and 1b again (at most one recipe per meal, no duplicates on same day)
-            for d in range(days):
-                for m in meals:
-                    prob2 += lpSum([x[(d, m, r['id'])] for r in recipes]) <= 1, f"AtMostOneRecipePerMeal_{d}_{m}"
-            
-            for d in range(days):
-                for r in recipes:
-                    prob2 += lpSum([x[(d, m, r['id'])] for m in meals]) <= 1, f"NoDuplicateRecipe_{d}_{r['id']}"
-            
-            # Add inventory constraints and expiry constraints
-            for item_name, item_data in inventory.items():
-                if isinstance(item_data, dict):
-                    available_qty = item_data.get('qty', 0.0)
-                else:
-                    available_qty = float(item_data) if isinstance(item_data, (int, float)) else 0.0
-                
-                total_usage = lpSum([
-                    r.get('ingredients', {}).get(item_name, 0.0) * x[(d, m, r['id'])]
-                    for d in range(days)
-                    for m in meals
-                    for r in recipes
-                ])
-                prob2 += total_usage <= available_qty, f"InventoryLimit_{item_name}"
-                
-                # Add expiry constraint
-                if isinstance(item_data, dict) and 'days_until_expiry' in item_data:
-                    try:
-                        days_until_expiry_raw = item_data.get('days_until_expiry', days + 1)
-                        days_until_expiry = int(round(float(days_until_expiry_raw)))
-                        if days_until_expiry <= 0:
-                            # Item is already expired, prevent all usage
-                            for d in range(days):
-                                for m in meals:
-                                    for r in recipes:
-                                        if item_name in r.get('ingredients', {}):
-                                            prob2 += x[(d, m, r['id'])] == 0, f"ExpiredItem2_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                        elif days_until_expiry < days:
-                            for d in range(days_until_expiry, days):
-                                for m in meals:
-                                    for r in recipes:
-                                        if item_name in r.get('ingredients', {}):
-                                            prob2 += x[(d, m, r['id'])] == 0, f"ExpiredItem2_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                    except (ValueError, TypeError) as e:
-                        print(f"Warning: Invalid days_until_expiry for {item_name}: {item_data.get('days_until_expiry')}, error: {e}")
-            
-            # Solve without consecutive constraints
-            prob2.solve()
-            status_code = LpStatus[prob2.status]
-            prob = prob2  # Use the relaxed problem
-            print(f"Relaxed solve status: {status_code}")
-            
-            # If still infeasible, try with fewer days
-            if status_code not in ['Optimal', 'Feasible']:
-                print(f"Still infeasible. Trying with fewer days...")
-                # Try reducing days progressively
-                for reduced_days in range(days - 1, 0, -1):
-                    prob3 = LpProblem(f"MealPlanOptimization_{reduced_days}days", LpMaximize)
-                    # Recalculate objective for reduced days
-                    reduced_objective_terms = []
-                    for d in range(reduced_days):
-                        for m in meals:
-                            for r in recipes:
-                                recipe_value = 0.0
-                                for item_name, amount_needed in r.get('ingredients', {}).items():
-                                    if item_name in inventory:
-                                        item_data = inventory[item_name]
-                                        if isinstance(item_data, dict):
-                                            expiry_weight = item_data.get('expiry_weight', 1.0)
-                                        else:
-                                            expiry_weight = 1.0
-                                        recipe_value += expiry_weight * amount_needed
-                                
-                                recipe_value_scaled = recipe_value * 100.0
-                                day_priority_multiplier = (reduced_days - d + 1) ** 2
-                                slot_bonus = base_slot_fill_bonus * day_priority_multiplier
-                                reduced_objective_terms.append((recipe_value_scaled + slot_bonus) * x[(d, m, r['id'])])
-                    
-                    prob3 += lpSum(reduced_objective_terms), "Maximize_Weighted_Inventory_Usage"
-                    
-                    # Add constraints for reduced days
-                    for d in range(reduced_days):
-                        for m in meals:
-                            prob3 += lpSum([x[(d, m, r['id'])] for r in recipes]) <= 1, f"AtMostOneRecipePerMeal_{d}_{m}"
-                    
-                    for d in range(reduced_days):
-                        for r in recipes:
-                            prob3 += lpSum([x[(d, m, r['id'])] for m in meals]) <= 1, f"NoDuplicateRecipe_{d}_{r['id']}"
-                    
-                    for item_name, item_data in inventory.items():
-                        if isinstance(item_data, dict):
-                            available_qty = item_data.get('qty', 0.0)
-                        else:
-                            available_qty = float(item_data) if isinstance(item_data, (int, float)) else 0.0
-                        
-                        total_usage = lpSum([
-                            r.get('ingredients', {}).get(item_name, 0.0) * x[(d, m, r['id'])]
-                            for d in range(reduced_days)
-                            for m in meals
-                            for r in recipes
-                        ])
-                        prob3 += total_usage <= available_qty, f"InventoryLimit_{item_name}"
-                        
-                        # Add expiry constraint
-                        if isinstance(item_data, dict) and 'days_until_expiry' in item_data:
-                            try:
-                                days_until_expiry_raw = item_data.get('days_until_expiry', reduced_days + 1)
-                                days_until_expiry = int(round(float(days_until_expiry_raw)))
-                                if days_until_expiry <= 0:
-                                    # Item is already expired, prevent all usage
-                                    for d in range(reduced_days):
-                                        for m in meals:
-                                            for r in recipes:
-                                                if item_name in r.get('ingredients', {}):
-                                                    prob3 += x[(d, m, r['id'])] == 0, f"ExpiredItem3_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                                elif days_until_expiry < reduced_days:
-                                    for d in range(days_until_expiry, reduced_days):
-                                        for m in meals:
-                                            for r in recipes:
-                                                if item_name in r.get('ingredients', {}):
-                                                    prob3 += x[(d, m, r['id'])] == 0, f"ExpiredItem3_{item_name}_Day{d}_Meal{m}_Recipe{r['id']}"
-                            except (ValueError, TypeError) as e:
-                                print(f"Warning: Invalid days_until_expiry for {item_name}: {item_data.get('days_until_expiry')}, error: {e}")
-                    
-                    prob3.solve()
-                    test_status = LpStatus[prob3.status]
-                    if test_status in ['Optimal', 'Feasible']:
-                        prob = prob3
-                        status_code = test_status
-                        days = reduced_days  # Update days for solution extraction
-                        print(f"Found feasible solution with {reduced_days} days")
-                        break
-        
-        if status_code == 'Optimal' or status_code == 'Feasible':
-            # Extract the solution
-            schedule = []
-            for d in range(days):
-                day_meals = []
-                for m in meals:
-                    # Find which recipe was selected for this meal
-                    for r in recipes:
-                        if value(x[(d, m, r['id'])]) == 1:
-                            day_meals.append({
-                                "type": m,
-                                "recipeId": r['id']
-                            })
-                            break
-                
-                # Only add days that have at least one meal (filter out empty days)
-                if len(day_meals) > 0:
-                    schedule.append({
-                        "day": f"Day {d + 1}",
-                        "meals": day_meals
-                    })
-            
-            return jsonify({
-                "status": status_code,
-                "schedule": schedule
-            })
-        else:
-            return jsonify({
-                "status": status_code,
-                "message": f"Solver status: {status_code}. No feasible solution found."
-            }), 400
-            
+        response = _json_response({
+            "status": "Pending",
+            "job_id": job_id
+        }, 202)
+        response.headers['Location'] = url_for('solve_job_status', job_id=job_id)
+        return response
+    
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error in solve_meal_plan: {str(e)}")
-        print(f"Traceback: {error_trace}")
-        return jsonify({
+        logger.exception("Error in solve_meal_plan: %s", e)
+        return _json_response({
             "status": "Error",
             "message": f"Server error: {str(e)}"
-        }), 500
+        }, 500)
+
+@app.route('/solve/<job_id>', methods=['GET'])
+def solve_job_status(job_id):
+    """
+    Polls a solve job started by POST /solve.
+    
+    Returns 202 with {"status": "Pending"} while the solver is still running. Once it
+    finishes, returns the body and status code documented on solve_meal_plan. A successful
+    result carries an ETag, and a matching If-None-Match gets an empty 304 instead.
+    """
+    with _state_lock:
+        job = _jobs.get(job_id)
+    
+    if job is None:
+        return _json_response({
+            "status": "Error",
+            "message": f"Unknown solve job: {job_id}"
+        }, 404)
+    
+    future, etag, submitted_at = job
+    if not future.done():
+        # The Future isn't cancelled here: identical payloads share it (see _submit_solve), so
+        # other jobs may still be within their own timeout. It stays cached until it finishes
+        # or the LRU evicts it
+        if time.monotonic() - submitted_at > SOLVE_TIMEOUT_SECONDS:
+            return _json_response({
+                "status": "Error",
+                "message": f"Solver did not finish within {SOLVE_TIMEOUT_SECONDS} seconds"
+            }, 504)
+        return _json_response({
+            "status": "Pending",
+            "job_id": job_id
+        }, 202)
+    
+    if future.cancelled():
+        return _json_response({
+            "status": "Error",
+            "message": "Solve was cancelled before it finished"
+        }, 504)
+    
+    try:
+        result, status = future.result()
+    except Exception as e:
+        logger.error("Error in solve job %s: %s", job_id, e, exc_info=e)
+        return _json_response({
+            "status": "Error",
+            "message": f"Server error: {str(e)}"
+        }, 500)
+    
+    response = _json_response(result, status)
+    if status == 200:
+        response.set_etag(etag)
+        response.make_conditional(request)
+    return response
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "ok", "message": "Solver server is running"})
+    return _json_response({"status": "ok", "message": "Solver server is running"})
 
 if __name__ == '__main__':
-    import os
+    logging.basicConfig(format=LOG_FORMAT)
     # Security: Only enable debug mode in development
-    # Set FLASK_ENV=development to enable debug mode, or FLASK_ENV=production to disable
-    debug_mode = os.getenv('FLASK_ENV', 'development') == 'development'
+    # Set FLASK_ENV=development to enable debug mode (off by default; the reloader and
+    # debugger slow every request down)
+    debug_mode = os.getenv('FLASK_ENV', 'production') == 'development'
     port = int(os.getenv('PORT', 5111))
     
-    print("Starting WasteNot Kitchen Solver Server on http://localhost:{}".format(port))
-    print("Health check: http://localhost:{}/health".format(port))
-    print("Debug mode: {}".format("ON" if debug_mode else "OFF"))
+    logger.info("Starting WasteNot Kitchen Solver Server on http://localhost:%d", port)
+    logger.info("Health check: http://localhost:%d/health", port)
+    logger.info("Debug mode: %s", "ON" if debug_mode else "OFF")
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
 
@@ -3,6 +3,7 @@ import { LOCAL_RECIPES } from "@shared/constants";
 import { convertAmount, normalizeUnit } from "@shared/utils";
 
 const API_URL = "http://localhost:5111/solve";
+const POLL_INTERVAL_MS = 250;
 
 // Helper to determine base unit type for normalization
 const getBaseUnit = (unit: string): string => {
@@ -108,12 +109,22 @@ export const generateOptimalMealPlan = async (
 
   let solverResponse;
   try {
-    const response = await fetch(API_URL, {
+    let response = await fetch(API_URL, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(payload)
     });
     
+    // The solver runs as a background job: POST returns 202 with a job id,
+    // which we poll until the solve finishes
+    if (response.status === 202) {
+      const { job_id } = await response.json();
+      do {
+        await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+        response = await fetch(`${API_URL}/${job_id}`);
+      } while (response.status === 202);
+    }
+    
     if (!response.ok) {
       // Try to read error message from response body
       let errorMessage = `Server Error: ${response.statusText}`;